@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Export the SigLIP image encoder to ONNX for ONNX Runtime / TensorRT.
+
+Usage:
+  python export_siglip_onnx.py
+  python export_siglip_onnx.py --model google/siglip-base-patch16-224
+
+Notes:
+  • The graph maps pixel_values (B, 3, H, W) to image embeddings (B, D), i.e. get_image_features.
+  • It is written next to image_similarity.py; once it exists and onnxruntime (or onnxruntime-gpu)
+    is installed, image_similarity runs it instead of the PyTorch forward (a running server notices
+    a new export within a minute). On CUDA devices ONNX Runtime picks the TensorRT or CUDA execution
+    provider when available.
+  • To benchmark a standalone TensorRT engine: trtexec --onnx=<exported file> --fp16
+"""
+
+import argparse
+
+import torch
+from PIL import Image
+from transformers import AutoModel, AutoProcessor
+
+from image_similarity import onnx_path
+
+
+class ImageEncoder(torch.nn.Module):
+    def __init__(self, model: torch.nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(self, pixel_values: torch.Tensor) -> torch.Tensor:
+        return self.model.get_image_features(pixel_values=pixel_values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the SigLIP image encoder to ONNX.")
+    parser.add_argument("--model", default="google/siglip-so400m-patch14-384", help="Hugging Face model id for SigLIP")
+    parser.add_argument("--opset", type=int, default=17, help="ONNX opset version")
+    args = parser.parse_args()
+
+    processor = AutoProcessor.from_pretrained(args.model)
+    model = AutoModel.from_pretrained(args.model)
+    model.eval()
+
+    dummy = processor(images=[Image.new("RGB", (384, 384))], return_tensors="pt")["pixel_values"]
+    out = onnx_path(args.model)
+    with torch.no_grad():
+        torch.onnx.export(
+            ImageEncoder(model),
+            (dummy,),
+            str(out),
+            input_names=["pixel_values"],
+            output_names=["image_embeds"],
+            dynamic_axes={"pixel_values": {0: "B"}, "image_embeds": {0: "B"}},
+            opset_version=args.opset,
+        )
+    print(f"Saved ONNX model to: {out}")
+
+
+if __name__ == "__main__":
+    main()